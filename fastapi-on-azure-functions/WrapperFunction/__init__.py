@@ -1,9 +1,17 @@
 # main.py
 from fastapi import FastAPI, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from azure.core import MatchConditions
+from azure.cosmos.exceptions import CosmosAccessConditionFailedError, CosmosResourceNotFoundError
+from azure.cosmos.partition_key import NonePartitionKeyValue, NullPartitionKeyValue
+import asyncio
+import os
 import uuid
+from cachetools import TTLCache
+from contextlib import asynccontextmanager
+from functools import partial
 from typing import List, Optional
-from datetime import datetime
-from fastapi.encoders import jsonable_encoder
+from datetime import datetime, timezone
 from models import (
     LostItem,
     LostItemBySubcategory,
@@ -14,94 +22,261 @@ from models import (
     Status,
     Item
 )
-from database import get_lost_item_container, get_lost_item_by_subcategory_container
-from chat_service import ChatService
+from database import (
+    LOST_ITEMS_PARTITION_KEY,
+    get_lost_item_container,
+    get_lost_item_by_subcategory_container,
+    init_database,
+    close_database
+)
+from chat_service import ChatService, ChatServiceError
+from responses import (
+    LostItemJSONResponse,
+    encode_json_array,
+    encode_pages,
+    raw_json_response
+)
 import logging
 
 # ロギングの設定
-logging.basicConfig(level=logging.INFO)
+# 本番では WARNING 以上のみ出力し、調査時は LOG_LEVEL=DEBUG でクエリ等を出力する
+logging.basicConfig(level=os.getenv("LOG_LEVEL", "WARNING").upper())
 logger = logging.getLogger(__name__)
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """起動時に Cosmos DB を準備し、終了時にクライアントを閉じる"""
+    await init_database()
+    yield
+    await close_database()
+
+app = FastAPI(default_response_class=LostItemJSONResponse, lifespan=lifespan)
+
+# Cosmos DB から 1 ページで取得する最大件数
+MAX_ITEM_COUNT = 200
+
+# クエリの骨格はフィルタの有無だけで決まるので、(市区町村, カテゴリ) の有無ごとに用意しておく
+LOST_ITEMS_QUERIES = {
+    (False, False): "SELECT * FROM c",
+    (True, False): "SELECT * FROM c WHERE c.createUserPlace = @municipality",
+    (False, True): "SELECT * FROM c WHERE c.item.categoryName = @categoryName",
+    (True, True): "SELECT * FROM c WHERE c.createUserPlace = @municipality AND c.item.categoryName = @categoryName",
+}
+SUBCATEGORY_QUERY = "SELECT * FROM c WHERE c.item.categoryName = @subcategory"
+
+# トランザクションバッチ 1 回あたりの最大操作数（Cosmos DB の上限）
+MAX_BATCH_SIZE = 100
+
+# 一括追加で 1 リクエストに含められる最大件数
+MAX_BULK_ITEMS = 1000
+
+# パッチ 1 回あたりの最大操作数（Cosmos DB の上限）
+MAX_PATCH_OPERATIONS = 10
+
+# GET レスポンスのキャッシュ（同じフィルタの組み合わせは短時間 Cosmos DB を引かずに返す）
+RESPONSE_CACHE_SIZE = 1024
+RESPONSE_CACHE_TTL = int(os.getenv("RESPONSE_CACHE_TTL", "30"))  # 秒
+response_cache = TTLCache(maxsize=RESPONSE_CACHE_SIZE, ttl=RESPONSE_CACHE_TTL)
+# 実行中のクエリ（キャッシュミス時、同じキーの同時リクエストは 1 つのクエリの結果を共有する）
+inflight_queries = {}
+# 書き込みのたびに進める世代番号（書き込み前に始まったクエリの結果をキャッシュしないため）
+cache_generation = 0
+
+# フィードレンジごとの並列クエリ数の上限（コネクションプールの枯渇を防ぐ）
+query_semaphore = asyncio.Semaphore(16)
+# 一括追加でのパーティションごとの並列バッチ数の上限
+batch_semaphore = asyncio.Semaphore(16)
 
 # Cosmos DB のコンテナ取得
 lost_items_container = get_lost_item_container()  # LostItems コンテナ
 lost_items_by_subcategory_container = get_lost_item_by_subcategory_container()  # LostItemBySubcategory コンテナ
 
-@app.get("/lostitems", response_model=List[LostItem])
+# 市区町村・カテゴリの正規化サービス（正規化結果をキャッシュするため、プロセス内で使い回す）
+# Azure OpenAI の同期クライアントを使うため、呼び出しはスレッドプールで行う
+chat_service = ChatService()
+
+async def query_all_feed_ranges(container, query: str, parameters: list) -> List[bytes]:
+    """
+    クロスパーティションクエリをフィードレンジごとに並列実行し、エンコード済みのページを返す
+    （SELECT * のみなので、各レンジの結果は連結するだけでよい）
+    """
+    feed_ranges = [feed_range async for feed_range in container.read_feed_ranges()]
+
+    async def run(feed_range) -> List[bytes]:
+        async with query_semaphore:
+            pages = container.query_items(
+                query=query,
+                parameters=parameters,
+                feed_range=feed_range,
+                max_item_count=MAX_ITEM_COUNT
+            ).by_page()
+            return await encode_pages(pages)
+
+    results = await asyncio.gather(*(run(feed_range) for feed_range in feed_ranges))
+    return [chunk for chunks in results for chunk in chunks]
+
+def invalidate_response_cache():
+    """書き込みの後に呼び、キャッシュ済みの GET 結果と実行中のクエリを破棄する"""
+    global cache_generation
+    cache_generation += 1
+    response_cache.clear()
+    inflight_queries.clear()
+
+async def fetch_and_cache(cache_key: tuple, run_query, generation: int) -> bytes:
+    """
+    run_query() の結果を JSON 配列にしてキャッシュする（0 件の結果もキャッシュする）
+    - クエリ中に書き込みがあった場合（世代が進んだ場合）は、古い可能性があるのでキャッシュしない
+    """
+    task = asyncio.current_task()
+    try:
+        chunks = await run_query()
+        logger.debug("Retrieved %d pages from Cosmos DB for %s", len(chunks), cache_key)
+        payload = encode_json_array(chunks)
+        if generation == cache_generation:
+            response_cache[cache_key] = payload
+        return payload
+    finally:
+        # 書き込みで破棄された後に、同じキーの新しいクエリが登録されていることがある
+        if inflight_queries.get(cache_key) is task:
+            del inflight_queries[cache_key]
+
+def consume_query_exception(task: asyncio.Task):
+    """待っていたリクエストがすべてキャンセルされても、クエリの例外が未取得のまま残らないようにする"""
+    if not task.cancelled() and task.exception() is not None:
+        logger.debug("Shared query failed: %s", task.exception())
+
+async def cached_query(cache_key: tuple, run_query) -> bytes:
+    """
+    キャッシュ済みのレスポンス本文を返す。無ければ Cosmos DB にクエリしてキャッシュする
+    - 同じキーのクエリが実行中なら、新たにクエリせずその結果を待つ（single-flight）
+    - 失敗した場合は待っていた全リクエストに同じ例外を返し、キャッシュはしない
+    """
+    payload = response_cache.get(cache_key)
+    if payload is not None:
+        return payload
+
+    task = inflight_queries.get(cache_key)
+    if task is None:
+        task = asyncio.ensure_future(fetch_and_cache(cache_key, run_query, cache_generation))
+        task.add_done_callback(consume_query_exception)
+        inflight_queries[cache_key] = task
+    # 待っているリクエストがキャンセルされても、共有しているクエリ自体は止めない
+    return await asyncio.shield(task)
+
+async def normalize(select, value: str, known_values: frozenset, label: str) -> str:
+    """
+    ChatService で入力を正規化し、既知の値であることを確かめる
+    - Azure OpenAI の呼び出しに失敗した場合は 502（上流の障害であり、クライアントの誤りではない）
+    - 正規化の結果が既知の値でない場合は 400
+    """
+    try:
+        normalized = await run_in_threadpool(select, value)
+    except ChatServiceError as e:
+        logger.error("Failed to normalize %s: %s", label, e)
+        raise HTTPException(status_code=502, detail=f"{label}の正規化に失敗しました。時間をおいて再度お試しください")
+
+    if normalized not in known_values:
+        raise HTTPException(status_code=400, detail=f"{label}を特定できませんでした: {normalized}")
+    return normalized
+
+def lost_item_partition_key(body: dict):
+    """LostItems コンテナに保存するドキュメントの、パーティションキーの値を返す"""
+    if LOST_ITEMS_PARTITION_KEY not in body:
+        # フィールドが無いドキュメントは「未定義」のパーティションに入る
+        return NonePartitionKeyValue
+    value = body[LOST_ITEMS_PARTITION_KEY]
+    return NullPartitionKeyValue if value is None else value
+
+def updatable_fields(body: dict) -> dict:
+    """
+    更新リクエストの辞書から、既存のドキュメントに反映してよいフィールドだけを返す
+    - `id` と Cosmos DB のシステムフィールド（`_` で始まるもの）はクライアントが変更できない
+    - パーティションキー (Municipality) はドキュメントの場所を決めるだけで、変更できない
+    """
+    return {
+        key: value
+        for key, value in body.items()
+        if key not in ("id", LOST_ITEMS_PARTITION_KEY) and not key.startswith("_")
+    }
+
+def json_pointer_escape(key: str) -> str:
+    """フィールド名をパッチ操作のパス（JSON Pointer）用にエスケープする"""
+    return key.replace("~", "~0").replace("/", "~1")
+
+def utc_now_iso() -> str:
+    """現在の UTC 日時を、Cosmos DB にそのまま保存できる ISO 形式の文字列で返す"""
+    return datetime.now(timezone.utc).isoformat(timespec="milliseconds")
+
+def to_cosmos_dict(item: LostItemRequest, **dict_options) -> dict:
+    """
+    リクエストを Cosmos DB にそのまま渡せる辞書に変換する
+    （datetime だけを ISO 形式の文字列にし、jsonable_encoder による全体の走査を避ける）
+    """
+    data = item.dict(**dict_options)
+    if data.get("findDateTime") is not None:
+        data["findDateTime"] = data["findDateTime"].isoformat()
+    return data
+
+@app.get("/lostitems", responses={200: {"model": List[LostItem]}})
 async def get_lost_items(municipality: Optional[str] = None, categoryName: Optional[str] = None):
     """
     Cosmos DB から忘れ物データをクエリし、結果を返す
     - `municipality`: 市区町村でフィルタリング
     - `categoryName`: 中分類でフィルタリング
     """
-    chat_service = ChatService()
-    query = "SELECT * FROM c"
-    filters = []
+    parameters = []
 
     if municipality:
-        municipality = chat_service.select_location(municipality)
-        filters.append(f"c.createUserPlace = '{municipality}'")
+        municipality = await normalize(chat_service.select_location, municipality, ChatService.KNOWN_MUNICIPALITIES, "市区町村")
+        parameters.append({"name": "@municipality", "value": municipality})
 
     if categoryName:
-        categoryName = chat_service.select_category(categoryName)
-        filters.append(f"c.item.categoryName = '{categoryName}'")
+        categoryName = await normalize(chat_service.select_category, categoryName, ChatService.KNOWN_CATEGORIES, "カテゴリ")
+        parameters.append({"name": "@categoryName", "value": categoryName})
 
-    if filters:
-        query += " WHERE " + " AND ".join(filters)
+    query = LOST_ITEMS_QUERIES[(bool(municipality), bool(categoryName))]
 
-    logger.info(f"Executing query: {query}")
+    logger.debug("Executing query: %s with parameters: %s", query, parameters)
 
     try:
-        items = list(lost_items_container.query_items(
-            query=query,
-            enable_cross_partition_query=True
-        ))
-        logger.info(f"Retrieved {len(items)} items from Cosmos DB")
+        # createUserPlace はパーティションキー (/Municipality) ではないため、フィードレンジごとに並列でクエリする
+        payload = await cached_query(
+            ("lostitems", municipality, categoryName),
+            partial(query_all_feed_ranges, lost_items_container, query, parameters)
+        )
     except Exception as e:
-        logger.error(f"Failed to execute query: {e}")
+        logger.error("Failed to execute query: %s", e)
         raise HTTPException(status_code=500, detail=f"データの取得に失敗しました: {str(e)}")
 
-    if not items:
-        return []
-
-    # Pydanticモデルに変換
-    try:
-        return [LostItem(**item) for item in items]
-    except Exception as e:
-        logger.error(f"Failed to convert data to Pydantic models: {e}")
-        raise HTTPException(status_code=500, detail=f"データの変換に失敗しました: {str(e)}")
+    # Cosmos DB の辞書は JSON 互換なので、Pydantic モデルを経由せずにシリアライズ済みの本文を返す
+    return raw_json_response(payload)
 
-@app.get("/lostitems/subcategory", response_model=List[LostItemBySubcategory])
+@app.get("/lostitems/subcategory", responses={200: {"model": List[LostItemBySubcategory]}})
 async def get_lost_items_by_subcategory(subcategory: str):
     """
     Cosmos DB の LostItemBySubcategory コンテナから、中分類ごとの忘れ物データをクエリし、結果を返す
     """
-    chat_service = ChatService()
-    subcategory = chat_service.select_category(subcategory)
-    query = f"SELECT * FROM c WHERE c.item.categoryName = '{subcategory}'"
+    subcategory = await normalize(chat_service.select_category, subcategory, ChatService.KNOWN_CATEGORIES, "カテゴリ")
+    query = SUBCATEGORY_QUERY
+    parameters = [{"name": "@subcategory", "value": subcategory}]
 
-    logger.info(f"Executing query: {query}")
+    logger.debug("Executing query: %s with parameters: %s", query, parameters)
 
     try:
-        items = list(lost_items_by_subcategory_container.query_items(
-            query=query,
-            enable_cross_partition_query=True
-        ))
-        logger.info(f"Retrieved {len(items)} items for subcategory '{subcategory}'")
+        # categoryName はパーティションキーではないため、フィードレンジごとに並列でクエリする
+        payload = await cached_query(
+            ("subcategory", subcategory),
+            partial(query_all_feed_ranges, lost_items_by_subcategory_container, query, parameters)
+        )
     except Exception as e:
-        logger.error(f"Failed to execute query: {e}")
+        logger.error("Failed to execute query: %s", e)
         raise HTTPException(status_code=500, detail=f"データの取得に失敗しました: {str(e)}")
 
-    if not items:
+    if payload == b"[]":
         raise HTTPException(status_code=404, detail=f"Lost items with subcategory '{subcategory}' not found")
 
-    # Pydanticモデルに変換
-    try:
-        return [LostItemBySubcategory(**item) for item in items]
-    except Exception as e:
-        logger.error(f"Failed to convert data to Pydantic models: {e}")
-        raise HTTPException(status_code=500, detail=f"データの変換に失敗しました: {str(e)}")
+    # Cosmos DB の辞書は JSON 互換なので、Pydantic モデルを経由せずにシリアライズ済みの本文を返す
+    return raw_json_response(payload)
 
 @app.post("/lostitems", response_model=LostItem)
 async def add_lost_item(item: LostItemRequest):
@@ -109,62 +284,177 @@ async def add_lost_item(item: LostItemRequest):
     新しい忘れ物データを Cosmos DB に追加する
     """
     try:
-        logger.info(f"Adding lost item: {item}")
+        logger.debug("Adding lost item: %s", item)
 
         # データ作成
-        current_time = datetime.utcnow()
-        lost_item_data = item.dict()
+        current_time = utc_now_iso()
+        lost_item_data = to_cosmos_dict(item)  # JSONシリアライズ可能な形式に変換
         lost_item_data["id"] = str(uuid.uuid4())  # 一意のIDを生成
         lost_item_data["DateFound"] = current_time  # データが追加された時間
 
-        # JSONシリアライズ可能な形式に変換
-        lost_item_data_encoded = jsonable_encoder(lost_item_data)
-
         # Cosmos DB にアイテムを追加
-        lost_items_container.create_item(body=lost_item_data_encoded)
-        logger.info(f"Added lost item with ID: {lost_item_data['id']}")
+        await lost_items_container.create_item(body=lost_item_data)
+        # キャッシュ済みの GET 結果が古いまま返らないよう破棄する
+        invalidate_response_cache()
+        logger.info("Added lost item with ID: %s", lost_item_data["id"])
 
-        # Pydanticモデルに変換
-        created_item = LostItem(**lost_item_data)
-
-        return created_item
+        # 検証済みのデータなので、Pydantic モデルを経由せずにそのまま返す（response_model はスキーマ用）
+        return LostItemJSONResponse(lost_item_data)
 
     except Exception as e:
-        logger.error(f"Failed to add lost item: {e}")
+        logger.error("Failed to add lost item: %s", e)
         raise HTTPException(status_code=500, detail=f"アイテムの追加に失敗しました: {str(e)}")
 
-@app.put("/lostitems/{item_id}", response_model=LostItem)
-async def update_lost_item(item_id: str, item: LostItemRequest):
+@app.post("/lostitems/bulk", response_model=List[LostItem])
+async def add_lost_items_bulk(items: List[LostItemRequest]):
     """
-    既存の忘れ物データを更新する
+    複数の忘れ物データを Cosmos DB にまとめて追加する
+    - パーティションキー (Municipality) の値ごとに、最大 100 件ずつトランザクションバッチで書き込む
+    - バッチ内はアトミックだが、パーティションをまたいだ全体はアトミックではない
+    - 1 リクエストあたり最大 1000 件
     """
+    if len(items) > MAX_BULK_ITEMS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"一度に追加できるアイテムは {MAX_BULK_ITEMS} 件までです"
+        )
+
     try:
-        logger.info(f"Updating lost item with ID: {item_id} with data: {item}")
+        logger.debug("Adding %d lost items in bulk", len(items))
 
-        # 既存のアイテムを取得
-        existing_item = lost_items_container.read_item(item=item_id, partition_key=item.createUserPlace)
-        logger.info(f"Retrieved existing item: {existing_item}")
+        # データ作成
+        current_time = utc_now_iso()
+        lost_items_data = []
+        items_by_partition = {}
+        for item in items:
+            lost_item_data = to_cosmos_dict(item)
+            lost_item_data["id"] = str(uuid.uuid4())  # 一意のIDを生成
+            lost_item_data["DateFound"] = current_time  # データが追加された時間
+            lost_items_data.append(lost_item_data)
+
+            # ドキュメントが実際に入るパーティションごとにまとめる
+            items_by_partition.setdefault(lost_item_partition_key(lost_item_data), []).append(lost_item_data)
+
+        async def write_partition(partition_key, bodies):
+            async with batch_semaphore:
+                for start in range(0, len(bodies), MAX_BATCH_SIZE):
+                    await lost_items_container.execute_item_batch(
+                        batch_operations=[("create", (body,)) for body in bodies[start:start + MAX_BATCH_SIZE]],
+                        partition_key=partition_key
+                    )
+
+        # Cosmos DB にアイテムを追加（パーティションごとに並列）
+        # 失敗したパーティションがあっても、他のパーティションの書き込みが終わるまで待つ
+        try:
+            results = await asyncio.gather(*(
+                write_partition(partition_key, bodies) for partition_key, bodies in items_by_partition.items()
+            ), return_exceptions=True)
+        finally:
+            # 一部のパーティションだけ書き込まれた場合も含め、キャッシュ済みの GET 結果を破棄する
+            invalidate_response_cache()
+        errors = [result for result in results if isinstance(result, BaseException)]
+        if errors:
+            raise errors[0]
+        logger.info("Added %d lost items across %d partitions", len(lost_items_data), len(items_by_partition))
+
+        # 検証済みのデータなので、Pydantic モデルを経由せずにそのまま返す（response_model はスキーマ用）
+        return LostItemJSONResponse(lost_items_data)
 
-        # 更新データを辞書に変換（未設定のフィールドを除外）
-        update_data = item.dict(exclude_unset=True)
-        update_data["DateUpdated"] = datetime.utcnow()  # 更新日時を追加
+    except Exception as e:
+        logger.error("Failed to add lost items in bulk: %s", e)
+        raise HTTPException(status_code=500, detail=f"アイテムの一括追加に失敗しました: {str(e)}")
 
-        # 更新されたフィールドのみを反映
-        for key, value in update_data.items():
-            existing_item[key] = value
+@app.put("/lostitems/{item_id}", response_model=LostItem)
+async def update_lost_item(item_id: str, item: LostItemRequest):
+    """
+    既存の忘れ物データを更新する
+    - パーティションキーはリクエストの `Municipality` から決める（無ければ「未定義」のパーティション）
+    - `id`・システムフィールド・パーティションキーは更新対象に含めない
+    """
+    try:
+        logger.debug("Updating lost item with ID: %s with data: %s", item_id, item)
 
-        # JSONシリアライズ可能な形式に変換
-        existing_item_encoded = jsonable_encoder(existing_item)
+        # 更新データを JSON シリアライズ可能な辞書に変換（未設定のフィールドを除外）
+        request_data = to_cosmos_dict(item, exclude_unset=True)
+        update_data = updatable_fields(request_data)
+        update_data["DateUpdated"] = utc_now_iso()  # 更新日時を追加
 
-        # Cosmos DB に更新されたアイテムを保存
-        lost_items_container.replace_item(item=existing_item, body=existing_item_encoded)
-        logger.info(f"Updated lost item with ID: {item_id}")
+        # 既存のアイテムを取得
+        existing_item = await lost_items_container.read_item(
+            item=item_id,
+            partition_key=lost_item_partition_key(request_data)
+        )
+        logger.debug("Retrieved existing item: %s", existing_item)
+        # 取得時点の ETag（更新データで上書きされる前に控えておく）
+        etag = existing_item["_etag"]
+
+        # 更新されたフィールドのみを反映（Cosmos DB から取得した値は JSON 互換のまま）
+        existing_item.update(update_data)
+
+        # Cosmos DB に更新されたアイテムを保存（取得後に他から更新されていれば失敗させる）
+        await lost_items_container.replace_item(
+            item=item_id,
+            body=existing_item,
+            etag=etag,
+            match_condition=MatchConditions.IfNotModified
+        )
+        # キャッシュ済みの GET 結果が古いまま返らないよう破棄する
+        invalidate_response_cache()
+        logger.info("Updated lost item with ID: %s", item_id)
+
+        # 検証済みのデータなので、Pydantic モデルを経由せずにそのまま返す（response_model はスキーマ用）
+        return LostItemJSONResponse(existing_item)
+
+    except CosmosResourceNotFoundError:
+        logger.warning("Lost item with ID %s was not found", item_id)
+        raise HTTPException(status_code=404, detail="アイテムが見つかりません")
+    except CosmosAccessConditionFailedError:
+        logger.warning("Lost item with ID %s was modified concurrently", item_id)
+        raise HTTPException(status_code=409, detail="アイテムが他の更新と競合しました。再取得してから更新してください")
+    except Exception as e:
+        logger.error("Failed to update lost item: %s", e)
+        raise HTTPException(status_code=500, detail=f"アイテムの更新に失敗しました: {str(e)}")
 
-        # Pydanticモデルに変換
-        updated_item = LostItem(**existing_item)
+@app.patch("/lostitems/{item_id}", response_model=LostItem)
+async def patch_lost_item(item_id: str, item: LostItemRequest):
+    """
+    既存の忘れ物データのうち、指定されたフィールドだけを部分更新する
+    - 取得と置換を行わず、Cosmos DB のパッチ操作 1 回で更新する
+    - パーティションキーはリクエストの `Municipality` から決める（無ければ「未定義」のパーティション）
+    - `id`・システムフィールド・パーティションキーは更新対象に含めない
+    """
+    # 更新データを辞書に変換（未設定のフィールドを除外）
+    request_data = to_cosmos_dict(item, exclude_unset=True)
+    update_data = updatable_fields(request_data)
+    update_data["DateUpdated"] = utc_now_iso()  # 更新日時を追加
 
-        return updated_item
+    if len(update_data) > MAX_PATCH_OPERATIONS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"一度に部分更新できるフィールドは {MAX_PATCH_OPERATIONS - 1} 個までです"
+        )
 
+    try:
+        logger.debug("Patching lost item with ID: %s with data: %s", item_id, update_data)
+
+        patched_item = await lost_items_container.patch_item(
+            item=item_id,
+            partition_key=lost_item_partition_key(request_data),
+            patch_operations=[
+                {"op": "set", "path": f"/{json_pointer_escape(key)}", "value": value}
+                for key, value in update_data.items()
+            ]
+        )
+        # キャッシュ済みの GET 結果が古いまま返らないよう破棄する
+        invalidate_response_cache()
+        logger.info("Patched lost item with ID: %s", item_id)
+
+        # Cosmos DB が返す更新後のドキュメントをそのまま返す（response_model はスキーマ用）
+        return LostItemJSONResponse(patched_item)
+
+    except CosmosResourceNotFoundError:
+        logger.warning("Lost item with ID %s was not found", item_id)
+        raise HTTPException(status_code=404, detail="アイテムが見つかりません")
     except Exception as e:
-        logger.error(f"Failed to update lost item: {e}")
+        logger.error("Failed to patch lost item: %s", e)
         raise HTTPException(status_code=500, detail=f"アイテムの更新に失敗しました: {str(e)}")
@@ -1,3 +1,5 @@
+import functools
+import logging
 import os
 from openai import AzureOpenAI
 
@@ -7,33 +9,49 @@ AZURE_OPENAI_API_KEY = os.getenv("AZURE_OPENAI_API_KEY")
 AZURE_OPENAI_ENDPOINT = os.getenv("AZURE_OPENAI_ENDPOINT")
 AZURE_OPENAI_DEPLOYMENT = os.getenv("AZURE_OPENAI_DEPLOYMENT")
 
-class ChatService:
-    def __init__(self):
-        # Azure OpenAIのクライアントを作成
-        self.client = AzureOpenAI(
-            api_version="2023-07-01-preview",
-            azure_endpoint=AZURE_OPENAI_ENDPOINT,
-        )
-
-    def select_category(self, message: str) -> str:
-        try:
-            # GPTに対して最も近い選択肢を探すプロンプト
-            prompt = """
+logger = logging.getLogger(__name__)
+
+# 正規化結果をキャッシュする最大件数（入力の種類は有限なので小さくてよい）
+SELECT_CACHE_SIZE = 4096
+
+# 正規化先のカテゴリ（中分類）の選択肢
+CATEGORIES = (
+    "手提げかばん",
+    "財布",
+    "傘",
+    "時計",
+    "メガネ",
+    "携帯電話",
+    "カメラ",
+    "鍵",
+    "本",
+    "アクセサリー",
+    "携帯音響品",
+)
+
+# 正規化先の場所（市区町村）の選択肢
+LOCATIONS = (
+    "旭川市",
+    "函館市",
+    "小樽市",
+    "千歳市",
+    "苫小牧市",
+    "室蘭市",
+    "北見市",
+    "札幌駅",
+)
+
+def format_choices(choices) -> str:
+    """選択肢をプロンプト内の箇条書きに変換する"""
+    return "\n".join(f"            - {choice}" for choice in choices)
+
+# GPTに対して最も近いカテゴリを探すプロンプト
+CATEGORY_PROMPT = """
             ユーザーから言葉が入力されるので選択肢から最も近い言葉を1つ選んで返してください。
             選択肢にない場合でも、**選択肢の中から**最も近いものを選んでください。
 
             # 選択肢
-            - 手提げかばん
-            - 財布
-            - 傘
-            - 時計
-            - メガネ
-            - 携帯電話
-            - カメラ
-            - 鍵
-            - 本
-            - アクセサリー
-            - 携帯音響品
+{choices}
 
             # 例
             ## Input
@@ -55,46 +73,15 @@ class ChatService:
             教科書
             ## Output
             本
-            """
-
-            # Azure OpenAI APIを使用してプロンプトを送信
-            completion = self.client.chat.completions.create(
-                model=AZURE_OPENAI_DEPLOYMENT,  # デプロイ名（例: gpt-35-turbo）
-                messages=[
-                    {
-                        "role": "system",
-                        "content": prompt,
-                    },
-                    {
-                        "role": "user",
-                        "content": message,
-                    },
-                ],
-            )
-
-            # 応答の文章のみを取得
-            response_text = completion.choices[0].message.content.strip()
-            print(f"Response: {response_text}")
-            return response_text
-        except Exception as e:
-            return f"Error: {str(e)}"
-    
-    def select_location(self, message: str) -> str:
-        try:
-            # GPTに対して最も近い選択肢を探すプロンプト
-            prompt = """
+            """.format(choices=format_choices(CATEGORIES))
+
+# GPTに対して最も近い場所を探すプロンプト
+LOCATION_PROMPT = """
             ユーザーから言葉が入力されるので選択肢から最も近い言葉を1つ選んで返してください。
             選択肢にない場合でも、**選択肢の中から**最も近いものを選んでください。
 
             # 選択肢
-            - 旭川市
-            - 函館市
-            - 小樽市
-            - 千歳市
-            - 苫小牧市
-            - 室蘭市
-            - 北見市
-            - 札幌駅
+{choices}
 
             # 例
             ## Input
@@ -116,26 +103,58 @@ class ChatService:
             ちとせ
             ## Output
             千歳市
-            """
-
-            # Azure OpenAI APIを使用してプロンプトを送信
-            completion = self.client.chat.completions.create(
-                model=AZURE_OPENAI_DEPLOYMENT,  # デプロイ名（例: gpt-35-turbo）
-                messages=[
-                    {
-                        "role": "system",
-                        "content": prompt,
-                    },
-                    {
-                        "role": "user",
-                        "content": message,
-                    },
-                ],
-            )
-
-            # 応答の文章のみを取得
-            response_text = completion.choices[0].message.content.strip()
-            print(f"Response: {response_text}")
-            return response_text
+            """.format(choices=format_choices(LOCATIONS))
+
+class ChatServiceError(Exception):
+    """Azure OpenAI による正規化に失敗したことを表す"""
+
+class ChatService:
+    # 正規化後の値として有効なもの（これ以外の値では Cosmos DB にクエリしない）
+    KNOWN_CATEGORIES = frozenset(CATEGORIES)
+    # プロンプトの例に含まれる「札幌市白石区」も返りうるため有効とする
+    KNOWN_MUNICIPALITIES = frozenset(LOCATIONS) | {"札幌市白石区"}
+
+    def __init__(self):
+        # Azure OpenAIのクライアントを作成
+        self.client = AzureOpenAI(
+            api_version="2023-07-01-preview",
+            azure_endpoint=AZURE_OPENAI_ENDPOINT,
+        )
+        # 同じ入力に対する正規化結果をインスタンス内でキャッシュする
+        # （例外はキャッシュされないため、失敗した入力は次回再試行される）
+        self._select = functools.lru_cache(maxsize=SELECT_CACHE_SIZE)(self._select)
+
+    def _select(self, prompt: str, message: str) -> str:
+        # Azure OpenAI APIを使用してプロンプトを送信
+        completion = self.client.chat.completions.create(
+            model=AZURE_OPENAI_DEPLOYMENT,  # デプロイ名（例: gpt-35-turbo）
+            messages=[
+                {
+                    "role": "system",
+                    "content": prompt,
+                },
+                {
+                    "role": "user",
+                    "content": message,
+                },
+            ],
+        )
+
+        # 応答の文章のみを取得
+        response_text = completion.choices[0].message.content.strip()
+        logger.debug("Response: %s", response_text)
+        return response_text
+
+    def select_category(self, message: str) -> str:
+        """カテゴリを正規化する（Azure OpenAI の呼び出しに失敗した場合は ChatServiceError）"""
+        try:
+            return self._select(CATEGORY_PROMPT, message)
+        except Exception as e:
+            raise ChatServiceError(f"Failed to select category: {e}") from e
+
+    def select_location(self, message: str) -> str:
+        """市区町村を正規化する（Azure OpenAI の呼び出しに失敗した場合は ChatServiceError）"""
+        try:
+            return self._select(LOCATION_PROMPT, message)
         except Exception as e:
-            return f"Error: {str(e)}"
+            raise ChatServiceError(f"Failed to select location: {e}") from e
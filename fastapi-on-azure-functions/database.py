@@ -1,5 +1,6 @@
 import os
-from azure.cosmos import CosmosClient, PartitionKey
+from azure.cosmos import PartitionKey
+from azure.cosmos.aio import CosmosClient
 
 # 環境変数から Cosmos DB の接続情報を取得
 COSMOS_ENDPOINT = os.getenv("COSMOS_ENDPOINT")
@@ -7,24 +8,46 @@ COSMOS_KEY = os.getenv("COSMOS_KEY")
 DATABASE_NAME = "MaterializedViewsDB"
 LOST_ITEMS_CONTAINER_NAME = "LostItems"
 LOST_ITEM_BY_SUBCATEGORY_CONTAINER_NAME = "LostItemsBySubcategory"
+# LostItems コンテナのパーティションキーとなるフィールド
+LOST_ITEMS_PARTITION_KEY = "Municipality"
 
-# Cosmos DB クライアントの初期化
-client = CosmosClient(COSMOS_ENDPOINT, COSMOS_KEY)
-database = client.create_database_if_not_exists(id=DATABASE_NAME)
+# アプリと同じリージョンのレプリカを優先して読み取る（未設定ならアカウントの既定リージョン）
+AZURE_REGION = os.getenv("AZURE_REGION")
+# Cosmos DB への 1 リクエストあたりのタイムアウト（秒、未設定なら SDK の既定値を使う）
+COSMOS_CONNECTION_TIMEOUT = os.getenv("COSMOS_CONNECTION_TIMEOUT")
+
+client_options = {"preferred_locations": [AZURE_REGION] if AZURE_REGION else []}
+if COSMOS_CONNECTION_TIMEOUT:
+    client_options["connection_timeout"] = int(COSMOS_CONNECTION_TIMEOUT)
+
+# Cosmos DB 非同期クライアントの初期化（プロセス内で 1 つだけ作成して使い回す）
+# （Python SDK はゲートウェイモードのみのため、Direct モードは指定できない）
+client = CosmosClient(COSMOS_ENDPOINT, COSMOS_KEY, **client_options)
+database = client.get_database_client(DATABASE_NAME)
 
 # LostItems コンテナ
-lost_items_container = database.create_container_if_not_exists(
-    id=LOST_ITEMS_CONTAINER_NAME,
-    partition_key=PartitionKey(path="/Municipality"),
-    offer_throughput=400
-)
+lost_items_container = database.get_container_client(LOST_ITEMS_CONTAINER_NAME)
 
 # LostItemBySubcategory コンテナ
-lost_item_by_subcategory_container = database.create_container_if_not_exists(
-    id=LOST_ITEM_BY_SUBCATEGORY_CONTAINER_NAME,
-    partition_key=PartitionKey(path="/Subcategory"),
-    offer_throughput=400
-)
+lost_item_by_subcategory_container = database.get_container_client(LOST_ITEM_BY_SUBCATEGORY_CONTAINER_NAME)
+
+async def init_database():
+    """データベースとコンテナが存在しなければ作成する（アプリ起動時に呼ぶ）"""
+    created_database = await client.create_database_if_not_exists(id=DATABASE_NAME)
+    await created_database.create_container_if_not_exists(
+        id=LOST_ITEMS_CONTAINER_NAME,
+        partition_key=PartitionKey(path=f"/{LOST_ITEMS_PARTITION_KEY}"),
+        offer_throughput=400
+    )
+    await created_database.create_container_if_not_exists(
+        id=LOST_ITEM_BY_SUBCATEGORY_CONTAINER_NAME,
+        partition_key=PartitionKey(path="/Subcategory"),
+        offer_throughput=400
+    )
+
+async def close_database():
+    """Cosmos DB クライアントのコネクションを閉じる（アプリ終了時に呼ぶ）"""
+    await client.close()
 
 def get_lost_item_container():
     """LostItems コンテナを返す"""
@@ -0,0 +1,68 @@
+from decimal import Decimal
+from typing import List
+
+import orjson
+from fastapi.responses import Response
+
+# datetime にタイムゾーンが無い場合は UTC として出力する
+ORJSON_OPTIONS = orjson.OPT_NAIVE_UTC
+
+
+def orjson_default(obj):
+    """orjson が標準で扱えない型を JSON 互換の値に変換する"""
+    if isinstance(obj, Decimal):
+        # jsonable_encoder と同じく、整数値は int、それ以外は float にする
+        return int(obj) if obj.as_tuple().exponent >= 0 else float(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class LostItemJSONResponse(Response):
+    """
+    Cosmos DB から取得した辞書をそのまま orjson でシリアライズするレスポンス
+    （Pydantic の再検証と jsonable_encoder を経由しない）
+    """
+
+    media_type = "application/json"
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, default=orjson_default, option=ORJSON_OPTIONS)
+
+
+def encode_page(items: list) -> bytes:
+    """1 ページ分のアイテムを、JSON 配列の括弧を除いた中身だけのバイト列に変換する"""
+    return orjson.dumps(items, default=orjson_default, option=ORJSON_OPTIONS)[1:-1]
+
+
+async def encode_pages(pages) -> List[bytes]:
+    """
+    Cosmos DB のページイテレータを 1 ページずつ encode_page でエンコードする
+    （保持するのはエンコード済みのバイト列だけで、辞書は 1 ページ分ずつしか持たない）
+    """
+    chunks = []
+    async for page in pages:
+        items = [item async for item in page]
+        if items:
+            chunks.append(encode_page(items))
+    return chunks
+
+
+def _with_separators(chunks: List[bytes]):
+    yield b"["
+    for index, chunk in enumerate(chunks):
+        if index:
+            yield b","
+        yield chunk
+    yield b"]"
+
+
+def encode_json_array(chunks: List[bytes]) -> bytes:
+    """
+    encode_page でエンコード済みのページ群を、1 つの JSON 配列のバイト列にまとめる
+    （括弧と区切りを含めて 1 回の join で組み立て、本文のコピーを 1 回に抑える）
+    """
+    return b"".join(_with_separators(chunks))
+
+
+def raw_json_response(payload: bytes) -> Response:
+    """シリアライズ済みの JSON をそのまま返す"""
+    return Response(payload, media_type="application/json")
@@ -0,0 +1,11 @@
+import os
+import sys
+
+# WrapperFunction と同じく、アプリのルートをインポートパスに追加する
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+# クライアントの初期化に必要なダミーの接続情報（テストでは実際には接続しない）
+os.environ.setdefault("COSMOS_ENDPOINT", "https://localhost:8081/")
+os.environ.setdefault("COSMOS_KEY", "dGVzdA==")
+os.environ.setdefault("AZURE_OPENAI_API_KEY", "test")
+os.environ.setdefault("AZURE_OPENAI_ENDPOINT", "https://example.openai.azure.com")
@@ -0,0 +1,314 @@
+import asyncio
+
+import pytest
+from azure.cosmos.exceptions import CosmosAccessConditionFailedError, CosmosResourceNotFoundError
+from azure.cosmos.partition_key import NonePartitionKeyValue
+from fastapi.testclient import TestClient
+
+import WrapperFunction
+from chat_service import ChatServiceError
+
+
+async def _aiter(values):
+    for value in values:
+        yield value
+
+
+class FakePager:
+    """query_items の戻り値 (AsyncItemPaged) の代わり"""
+
+    def __init__(self, items, max_item_count):
+        self.items = items
+        self.max_item_count = max_item_count
+
+    def by_page(self):
+        size = self.max_item_count or len(self.items) or 1
+        return _aiter([_aiter(self.items[i:i + size]) for i in range(0, len(self.items), size)])
+
+
+class FakeContainer:
+    """フィードレンジごとにアイテムを持つ、Cosmos DB の非同期コンテナの代わり"""
+
+    def __init__(self, items_by_range):
+        self.items_by_range = items_by_range
+        self.queries = []
+        self.batches = []
+        self.failing_partitions = set()
+        self.patches = []
+        self.documents = {}
+        self.replaces = []
+        self.conflicting_items = set()
+        self.batch_delay = 0
+        self.active_batches = 0
+        self.max_active_batches = 0
+
+    def read_feed_ranges(self):
+        # 実際の SDK と同じく、コルーチンではなく非同期イテレータを返す
+        return _aiter([{"range": name} for name in self.items_by_range])
+
+    def query_items(self, query, parameters=None, feed_range=None, partition_key=None, max_item_count=None):
+        self.queries.append({"query": query, "parameters": parameters, "feed_range": feed_range, "partition_key": partition_key})
+        if feed_range is None:
+            items = [item for items in self.items_by_range.values() for item in items]
+        else:
+            items = self.items_by_range[feed_range["range"]]
+        return FakePager(items, max_item_count)
+
+    async def execute_item_batch(self, batch_operations, partition_key):
+        if partition_key in self.failing_partitions:
+            raise RuntimeError(f"batch failed for {partition_key}")
+        self.active_batches += 1
+        self.max_active_batches = max(self.max_active_batches, self.active_batches)
+        await asyncio.sleep(self.batch_delay)
+        self.active_batches -= 1
+        self.batches.append({"partition_key": partition_key, "bodies": [args[0] for _, args in batch_operations]})
+
+    async def patch_item(self, item, partition_key, patch_operations):
+        if item not in self.items_by_range:
+            raise CosmosResourceNotFoundError(message=f"{item} not found")
+        self.patches.append({"item": item, "partition_key": partition_key, "patch_operations": patch_operations})
+        return {"id": item}
+
+    async def read_item(self, item, partition_key):
+        if (item, partition_key) not in self.documents:
+            raise CosmosResourceNotFoundError(message=f"{item} not found")
+        return dict(self.documents[(item, partition_key)])
+
+    async def replace_item(self, item, body, etag=None, match_condition=None):
+        if item in self.conflicting_items:
+            raise CosmosAccessConditionFailedError(message=f"{item} was modified")
+        self.replaces.append({"item": item, "body": body, "etag": etag})
+        return body
+
+
+class FakeChatService:
+    def select_location(self, message):
+        return message
+
+    def select_category(self, message):
+        return message
+
+
+class FailingChatService:
+    def select_location(self, message):
+        raise ChatServiceError("Failed to select location: connection refused")
+
+    def select_category(self, message):
+        raise ChatServiceError("Failed to select category: connection refused")
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(WrapperFunction, "chat_service", FakeChatService())
+    WrapperFunction.response_cache.clear()
+    # lifespan (Cosmos DB の準備) は実行しない
+    return TestClient(WrapperFunction.app)
+
+
+def test_get_lost_items_fans_out_across_feed_ranges(client, monkeypatch):
+    container = FakeContainer({
+        "a": [{"id": str(i)} for i in range(250)],
+        "b": [{"id": "b1"}],
+        "c": [],
+    })
+    monkeypatch.setattr(WrapperFunction, "lost_items_container", container)
+
+    response = client.get("/lostitems", params={"categoryName": "財布"})
+
+    assert response.status_code == 200
+    assert sorted(item["id"] for item in response.json()) == sorted([str(i) for i in range(250)] + ["b1"])
+    assert sorted(query["feed_range"]["range"] for query in container.queries) == ["a", "b", "c"]
+    assert all(query["parameters"] == [{"name": "@categoryName", "value": "財布"}] for query in container.queries)
+
+
+def test_get_lost_items_by_municipality_queries_all_feed_ranges(client, monkeypatch):
+    # createUserPlace はパーティションキーではないので、単一パーティションに絞ってはいけない
+    container = FakeContainer({"a": [{"id": "1", "createUserPlace": "北見市"}], "b": []})
+    monkeypatch.setattr(WrapperFunction, "lost_items_container", container)
+
+    response = client.get("/lostitems", params={"municipality": "北見市"})
+
+    assert response.status_code == 200
+    assert [item["id"] for item in response.json()] == ["1"]
+    assert all(query["partition_key"] is None for query in container.queries)
+    assert len(container.queries) == 2
+
+
+def test_get_lost_items_by_subcategory_returns_404_when_empty(client, monkeypatch):
+    container = FakeContainer({"a": [], "b": []})
+    monkeypatch.setattr(WrapperFunction, "lost_items_by_subcategory_container", container)
+
+    response = client.get("/lostitems/subcategory", params={"subcategory": "財布"})
+
+    assert response.status_code == 404
+    assert len(container.queries) == 2
+
+
+def test_add_lost_items_bulk_groups_by_container_partition_key(client, monkeypatch):
+    container = FakeContainer({})
+    monkeypatch.setattr(WrapperFunction, "lost_items_container", container)
+
+    items = [{"createUserPlace": "北見市"} for _ in range(150)] + [{"createUserPlace": "函館市", "Municipality": "函館市"}]
+    response = client.post("/lostitems/bulk", json=items)
+
+    assert response.status_code == 200
+    assert len(response.json()) == 151
+    # Municipality の無いドキュメントは createUserPlace ではなく「未定義」のパーティションに書き込む
+    batches = sorted(container.batches, key=lambda batch: len(batch["bodies"]))
+    assert [(batch["partition_key"], len(batch["bodies"])) for batch in batches] == [
+        ("函館市", 1), (NonePartitionKeyValue, 50), (NonePartitionKeyValue, 100)
+    ]
+
+
+def test_add_lost_items_bulk_clears_cache_on_partial_failure(client, monkeypatch):
+    container = FakeContainer({})
+    container.failing_partitions.add("函館市")
+    monkeypatch.setattr(WrapperFunction, "lost_items_container", container)
+    WrapperFunction.response_cache[("lostitems", None, None)] = b"[]"
+
+    response = client.post("/lostitems/bulk", json=[{"Municipality": "北見市"}, {"Municipality": "函館市"}])
+
+    assert response.status_code == 500
+    assert [batch["partition_key"] for batch in container.batches] == ["北見市"]
+    assert len(WrapperFunction.response_cache) == 0
+
+
+def test_add_lost_items_bulk_waits_for_all_partitions_before_failing(client, monkeypatch):
+    container = FakeContainer({})
+    container.failing_partitions.add("函館市")
+    container.batch_delay = 0.05
+    monkeypatch.setattr(WrapperFunction, "lost_items_container", container)
+    monkeypatch.setattr(WrapperFunction, "batch_semaphore", asyncio.Semaphore(2))
+
+    items = [{"Municipality": "函館市"}] + [{"Municipality": f"市{i}"} for i in range(5)]
+    response = client.post("/lostitems/bulk", json=items)
+
+    assert response.status_code == 500
+    # 失敗したパーティション以外の書き込みは、レスポンスを返す前にすべて終わっている
+    assert sorted(batch["partition_key"] for batch in container.batches) == [f"市{i}" for i in range(5)]
+    assert container.max_active_batches == 2
+
+
+def test_add_lost_items_bulk_rejects_too_many_items(client, monkeypatch):
+    container = FakeContainer({})
+    monkeypatch.setattr(WrapperFunction, "lost_items_container", container)
+
+    response = client.post("/lostitems/bulk", json=[{}] * (WrapperFunction.MAX_BULK_ITEMS + 1))
+
+    assert response.status_code == 413
+    assert container.batches == []
+
+
+def test_query_started_before_write_is_not_cached():
+    key = ("lostitems", None, None)
+    WrapperFunction.response_cache.clear()
+
+    async def scenario():
+        started = asyncio.Event()
+        release = asyncio.Event()
+
+        async def run_query():
+            started.set()
+            await release.wait()
+            return [b'{"id":"old"}']
+
+        pending = asyncio.ensure_future(WrapperFunction.cached_query(key, run_query))
+        await started.wait()
+        # クエリの実行中に書き込みがあった
+        WrapperFunction.invalidate_response_cache()
+        release.set()
+
+        assert await pending == b'[{"id":"old"}]'
+        assert key not in WrapperFunction.response_cache
+        assert key not in WrapperFunction.inflight_queries
+
+    asyncio.run(scenario())
+
+
+def test_get_lost_items_returns_502_when_normalization_fails(client, monkeypatch):
+    container = FakeContainer({"a": []})
+    monkeypatch.setattr(WrapperFunction, "lost_items_container", container)
+    monkeypatch.setattr(WrapperFunction, "chat_service", FailingChatService())
+
+    response = client.get("/lostitems", params={"municipality": "きたみ"})
+
+    assert response.status_code == 502
+    assert "connection refused" not in response.json()["detail"]
+    assert container.queries == []
+
+
+def test_get_lost_items_by_subcategory_returns_400_for_unknown_category(client, monkeypatch):
+    container = FakeContainer({"a": []})
+    monkeypatch.setattr(WrapperFunction, "lost_items_by_subcategory_container", container)
+
+    response = client.get("/lostitems/subcategory", params={"subcategory": "自転車"})
+
+    assert response.status_code == 400
+    assert container.queries == []
+
+
+def test_patch_lost_item_skips_system_fields_and_escapes_paths(client, monkeypatch):
+    container = FakeContainer({"1": []})
+    monkeypatch.setattr(WrapperFunction, "lost_items_container", container)
+
+    response = client.patch("/lostitems/1", json={
+        "createUserPlace": "北見市", "id": "2", "_etag": "x", "memo": "m", "a/b~c": 1
+    })
+
+    assert response.status_code == 200
+    [patch] = container.patches
+    # API で作成したドキュメントには Municipality が無いので、「未定義」のパーティションにある
+    assert patch["partition_key"] is NonePartitionKeyValue
+    assert sorted(op["path"] for op in patch["patch_operations"]) == [
+        "/DateUpdated", "/a~1b~0c", "/createUserPlace", "/memo"
+    ]
+
+
+def test_patch_lost_item_uses_municipality_as_partition_key(client, monkeypatch):
+    container = FakeContainer({"1": []})
+    monkeypatch.setattr(WrapperFunction, "lost_items_container", container)
+
+    response = client.patch("/lostitems/1", json={"Municipality": "北見市", "memo": "m"})
+
+    assert response.status_code == 200
+    [patch] = container.patches
+    assert patch["partition_key"] == "北見市"
+    assert sorted(op["path"] for op in patch["patch_operations"]) == ["/DateUpdated", "/memo"]
+
+
+def test_patch_lost_item_returns_404_when_missing(client, monkeypatch):
+    container = FakeContainer({})
+    monkeypatch.setattr(WrapperFunction, "lost_items_container", container)
+
+    response = client.patch("/lostitems/1", json={"createUserPlace": "北見市", "memo": "m"})
+
+    assert response.status_code == 404
+
+
+def test_update_lost_item_keeps_id_and_etag_from_stored_item(client, monkeypatch):
+    container = FakeContainer({})
+    container.documents[("1", NonePartitionKeyValue)] = {"id": "1", "_etag": "stored", "memo": "old"}
+    monkeypatch.setattr(WrapperFunction, "lost_items_container", container)
+
+    response = client.put("/lostitems/1", json={"createUserPlace": "北見市", "id": "2", "_etag": "forged", "memo": "new"})
+
+    assert response.status_code == 200
+    [replace] = container.replaces
+    assert replace["item"] == "1"
+    assert replace["etag"] == "stored"
+    assert replace["body"]["id"] == "1"
+    assert replace["body"]["_etag"] == "stored"
+    assert replace["body"]["memo"] == "new"
+    assert replace["body"]["createUserPlace"] == "北見市"
+
+
+def test_update_lost_item_returns_409_on_etag_mismatch(client, monkeypatch):
+    container = FakeContainer({})
+    container.documents[("1", "北見市")] = {"id": "1", "_etag": "stored", "Municipality": "北見市"}
+    container.conflicting_items.add("1")
+    monkeypatch.setattr(WrapperFunction, "lost_items_container", container)
+
+    response = client.put("/lostitems/1", json={"Municipality": "北見市", "memo": "new"})
+
+    assert response.status_code == 409
+    assert container.replaces == []
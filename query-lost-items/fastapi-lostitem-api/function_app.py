@@ -1,17 +1,10 @@
-import logging
 import azure.functions as func
-from fastapi import FastAPI
-from fastapi.routing import APIRoute
 from main import app as fastapi_app
 
-# FastAPI のアプリケーションを Azure Functions に統合
-app = FastAPI()
-
-# FastAPI のルートを Azure Functions に追加
-for route in fastapi_app.routes:
-    if isinstance(route, APIRoute):
-        app.add_api_route(route.path, route.endpoint, methods=route.methods)
+# FastAPI のアプリケーションをそのまま Azure Functions に統合する
+# （ルートを別の FastAPI に複製すると、登録が二重になり response_model などの設定も失われる）
+asgi_middleware = func.AsgiMiddleware(fastapi_app)
 
 # Azure Functions 用の HTTP トリガー
 async def main(req: func.HttpRequest, context: func.Context) -> func.HttpResponse:
-    return func.AsgiMiddleware(app)(req, context)
+    return await asgi_middleware.handle_async(req, context)
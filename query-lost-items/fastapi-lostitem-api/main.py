@@ -18,12 +18,18 @@ async def get_lost_items(municipality: str = None, subcategory: str = None):
     """
     query = "SELECT * FROM c"
     filters = []
+    parameters = []
+    # Municipality はパーティションキーなので、指定時は単一パーティションに絞る
+    query_options = {"enable_cross_partition_query": True}
 
     if municipality:
-        filters.append(f"c.Municipality = '{municipality}'")
+        filters.append("c.Municipality = @municipality")
+        parameters.append({"name": "@municipality", "value": municipality})
+        query_options = {"partition_key": municipality}
 
     if subcategory:
-        filters.append(f"c.Subcategory = '{subcategory}'")
+        filters.append("c.Subcategory = @subcategory")
+        parameters.append({"name": "@subcategory", "value": subcategory})
 
     if filters:
         query += " WHERE " + " AND ".join(filters)
@@ -31,7 +37,8 @@ async def get_lost_items(municipality: str = None, subcategory: str = None):
     # クエリ実行 (LostItems コンテナ)
     items = list(lost_items_container.query_items(
         query=query,
-        enable_cross_partition_query=True
+        parameters=parameters,
+        **query_options
     ))
 
     if not items:
@@ -44,12 +51,13 @@ async def get_lost_items_by_subcategory(subcategory: str):
     """
     Cosmos DB の LostItemBySubcategory コンテナから、中分類ごとの忘れ物データをクエリし、結果を返す
     """
-    query = f"SELECT * FROM c WHERE c.Subcategory = '{subcategory}'"
-    
-    # クエリ実行 (LostItemBySubcategory コンテナ)
+    query = "SELECT * FROM c WHERE c.Subcategory = @subcategory"
+
+    # クエリ実行 (LostItemBySubcategory コンテナ、Subcategory はパーティションキー)
     items = list(lost_items_by_subcategory_container.query_items(
         query=query,
-        enable_cross_partition_query=True
+        parameters=[{"name": "@subcategory", "value": subcategory}],
+        partition_key=subcategory
     ))
 
     if not items: